@@ -1,8 +1,8 @@
 import asyncio
 import time
-from typing import Dict, Any, Optional, Set, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set, List, Tuple
 
-import aiohttp
 import discord
 
 import cai
@@ -10,6 +10,15 @@ import utils
 import webhook
 from utils import update_session_data, get_session_data
 
+# Longest time the inactivity monitor sleeps without any channel activity
+MONITOR_IDLE_TIMEOUT = 30  # In seconds
+# Minimum wait before retrying a response that could not be generated
+RESPONSE_RETRY_DELAY = 5  # In seconds
+
+# Bounds for referenced messages that had to be fetched over REST
+REFERENCE_CACHE_SIZE = 256
+REFERENCE_CACHE_TTL = 600  # In seconds
+
 
 class discord_AI_bot:
     def __init__(self):
@@ -21,6 +30,79 @@ class discord_AI_bot:
         self.processing_channels: Set[str] = set()
         # Locks for each channel
         self.channel_locks: Dict[str, asyncio.Lock] = {}
+        # Activity signals for each channel, waited on by the inactivity monitor
+        self.channel_events: Dict[str, asyncio.Event] = {}
+        # Monotonic time before which the monitor must not retry a failed response
+        self.retry_after: Dict[str, float] = {}
+        # Fetches of reply references, keyed by (channel_id, message_id)
+        self._reference_cache: "OrderedDict[Tuple[int, int], Tuple[float, asyncio.Task]]" = OrderedDict()
+
+    async def _resolve_reference(self, message) -> discord.Message:
+        """
+        Resolve the message a reply points to, avoiding REST calls when possible.
+
+        discord.py usually ships the referenced message with the gateway event or
+        keeps it in its message cache. Only when neither has it is the message
+        fetched. The fetch task is kept in a small LRU cache with a TTL, so the
+        channels processing the same message concurrently share a single request.
+
+        Args:
+            message: The Discord message containing the reference
+
+        Returns:
+            discord.Message: The referenced message
+        """
+        reference = message.reference
+        ref_message = reference.resolved or reference.cached_message
+        if isinstance(ref_message, discord.Message):
+            return ref_message
+
+        key = (reference.channel_id, reference.message_id)
+        now = time.monotonic()
+        cached = self._reference_cache.get(key)
+        if cached and now - cached[0] < REFERENCE_CACHE_TTL:
+            self._reference_cache.move_to_end(key)
+            fetch = cached[1]
+        else:
+            fetch = asyncio.create_task(
+                message.channel.fetch_message(reference.message_id))
+            self._reference_cache[key] = (now, fetch)
+            self._reference_cache.move_to_end(key)
+            while len(self._reference_cache) > REFERENCE_CACHE_SIZE:
+                self._reference_cache.popitem(last=False)
+
+        try:
+            # Shielded so a cancelled caller doesn't cancel the shared fetch
+            return await asyncio.shield(fetch)
+        except Exception:
+            # Don't keep failed fetches around, the next caller retries
+            if self._reference_cache.get(key, (None, None))[1] is fetch:
+                del self._reference_cache[key]
+            raise
+
+    def _notify_activity(self, server_id: str, channel_id: str):
+        """
+        Wake up the inactivity monitor of a channel, if one is running.
+
+        Args:
+            server_id: The Discord server ID
+            channel_id: The Discord channel ID
+        """
+        event = self.channel_events.get(f"{server_id}_{channel_id}")
+        if event is not None:
+            event.set()
+
+    def _postpone_response(self, channel_key: str):
+        """
+        Keep the inactivity monitor from retrying a channel right away after
+        a response attempt left its cached messages untouched.
+
+        Args:
+            channel_key: The "<server_id>_<channel_id>" key of the channel
+        """
+        delay = max(utils.config.options.delay_for_generation,
+                    RESPONSE_RETRY_DELAY)
+        self.retry_after[channel_key] = time.monotonic() + delay
 
     async def sync_config(self, client):
         """
@@ -56,14 +138,12 @@ class discord_AI_bot:
                 webhook_url = session_data.get("webhook_url")
                 if webhook_url:
                     try:
-                        async with aiohttp.ClientSession() as http_session:
-                            async with http_session.get(info["avatar_url"]) as resp:
-                                image_bytes = await resp.read() if resp.status == 200 else b""
-                            webhook_obj = discord.Webhook.from_url(
-                                webhook_url, session=http_session)
-                            await webhook_obj.edit(name=info["name"], avatar=image_bytes, reason="Sync webhook info")
-                            utils.log.info(
-                                "Updated webhook for channel %s with new info from character_id %s", channel_id, character_id)
+                        async with webhook.get_http_session().get(info["avatar_url"]) as resp:
+                            image_bytes = await resp.read() if resp.status == 200 else b""
+                        webhook_obj = webhook.get_webhook(webhook_url)
+                        await webhook_obj.edit(name=info["name"], avatar=image_bytes, reason="Sync webhook info")
+                        utils.log.info(
+                            "Updated webhook for channel %s with new info from character_id %s", channel_id, character_id)
                     except Exception as e:
                         utils.log.error(
                             "Failed to update webhook for channel %s: %s", channel_id, e)
@@ -95,10 +175,12 @@ class discord_AI_bot:
                     utils.update_session_data(
                         server_id, channel_id_str, session)
                 )
+                # Restart the monitor's countdown
+                self._notify_activity(server_id, channel_id_str)
 
                 utils.log.debug(
-                    f"Typing activity from {user} in {channel.name}, "
-                    f"session extended to {current_time}"
+                    "Typing activity from %s in %s, session extended to %s",
+                    user, channel.name, current_time
                 )
 
         except Exception as e:
@@ -123,13 +205,14 @@ class discord_AI_bot:
             server_id = str(message.guild.id)
 
             # Get all channels that need to process this message
-            channels_to_process = []
             server_channels = utils.session_cache.get(
                 server_id, {}).get("channels", {})
+            channels_to_process = [
+                channel_id for channel_id, session in server_channels.items() if session]
 
-            for channel_id, session in server_channels.items():
-                if session:
-                    channels_to_process.append(channel_id)
+            # Nothing to do in servers without an active session
+            if not channels_to_process:
+                return
 
             utils.log.info(
                 f"Processing message for {len(channels_to_process)} channels in server {server_id}")
@@ -185,7 +268,7 @@ class discord_AI_bot:
                 if not message.webhook_id:
                     if message.reference:
                         try:
-                            ref_message = await message.channel.fetch_message(message.reference.message_id)
+                            ref_message = await self._resolve_reference(message)
                             utils.capture_message(message, ref_message)
                         except Exception as e:
                             utils.log.error(
@@ -197,6 +280,7 @@ class discord_AI_bot:
                 session["last_message_time"] = time.time()
                 session["awaiting_response"] = False
                 await utils.update_session_data(server_id, channel_id_str, session)
+                self._notify_activity(server_id, channel_id_str)
 
                 # Create new task for AI response
                 # task_key = f"ai_response_{server_id}_{channel_id_str}"
@@ -230,7 +314,7 @@ class discord_AI_bot:
         channel_key = f"{server_id}_{channel_id_str}"
         if channel_key in self.processing_channels:
             utils.log.debug(
-                f"Channel {channel_id_str} is already being processed, skipping")
+                "Channel %s is already being processed, skipping", channel_id_str)
             return
 
         # Mark channel as being processed
@@ -245,20 +329,15 @@ class discord_AI_bot:
                 return
 
             if not session.get("chat_id"):
-                create_new_chat = utils.config_yaml["Character_AI"].get(
-                    "new_chat_on_reset", False)
-                session["chat_id"], _ = await cai.new_chat_id(create_new_chat, session, server_id, channel_id_str)
+                session["chat_id"], _ = await cai.new_chat_id(utils.config.character_ai.new_chat_on_reset, session, server_id, channel_id_str)
                 await utils.update_session_data(server_id, channel_id_str, session)
 
             session["awaiting_response"] = True
             session["last_message_time"] = time.time()
             await utils.update_session_data(server_id, channel_id_str, session)
 
-            # Get cached messages for this channel
-            cached_data = await asyncio.to_thread(utils.read_json, "messages_cache.json") or {}
-
             # Check if there are any messages to respond to
-            if not cached_data.get(server_id, {}).get(channel_id_str, {}):
+            if not utils.cached_message_count(server_id, channel_id_str):
                 utils.log.info(
                     "No cached messages for channel %s", channel_id_str)
                 session["awaiting_response"] = False
@@ -275,7 +354,7 @@ class discord_AI_bot:
             current_session = utils.get_session_data(server_id, channel_id_str)
             if current_session and current_session.get("last_message_time", 0) > session.get("last_message_time", 0):
                 utils.log.debug(
-                    f"User still typing or sent new message in channel {channel_id_str}, delaying response")
+                    "User still typing or sent new message in channel %s, delaying response", channel_id_str)
                 self.processing_channels.discard(channel_key)
                 return
 
@@ -283,10 +362,10 @@ class discord_AI_bot:
             utils.log.info(
                 f"Queueing AI response for channel {channel_id_str} (character_id: {session['character_id']}, chat_id: {session['chat_id']})")
 
-            async def handle_response(response):
+            async def handle_response(response, consumed=None):
                 try:
                     # Process the response
-                    if utils.config_yaml["MessageFormatting"]["remove_emojis"]["AI"]:
+                    if utils.config.formatting.remove_ai_emojis:
                         response = utils.remove_emoji(response)
 
                     # Check if the response is empty or just whitespace
@@ -304,7 +383,7 @@ class discord_AI_bot:
                             f"Sent AI response via webhook for channel {channel_id_str}")
 
                         # Clear the processed messages from cache
-                        await utils.remove_sent_messages_from_cache(server_id, channel_id_str)
+                        await utils.remove_sent_messages_from_cache(server_id, channel_id_str, consumed)
                     else:
                         utils.log.error(
                             f"Webhook URL not found for channel {channel_id_str}")
@@ -322,6 +401,7 @@ class discord_AI_bot:
                 finally:
                     # Mark the channel as no longer being processed
                     self.processing_channels.discard(channel_key)
+                    self._notify_activity(server_id, channel_id_str)
 
             # Queue the response with a timeout
             try:
@@ -331,7 +411,6 @@ class discord_AI_bot:
                     await cai.queue_response(
                         server_id,
                         channel_id_str,
-                        message,
                         session["chat_id"],
                         session["character_id"],
                         handle_response
@@ -339,6 +418,7 @@ class discord_AI_bot:
             except asyncio.TimeoutError:
                 utils.log.error(
                     f"Timeout queueing response for channel {channel_id_str}")
+                self._postpone_response(channel_key)
                 self.processing_channels.discard(channel_key)
                 session["awaiting_response"] = False
                 await utils.update_session_data(server_id, channel_id_str, session)
@@ -347,6 +427,7 @@ class discord_AI_bot:
             utils.log.error(
                 "Error in AI_send_message for channel %s: %s", channel_id_str, e)
             # Mark channel as no longer being processed
+            self._postpone_response(channel_key)
             self.processing_channels.discard(channel_key)
 
             # Update session
@@ -396,6 +477,10 @@ class discord_AI_bot:
         """
         Internal method to monitor channel inactivity.
 
+        Instead of polling, the monitor sleeps until the channel signals activity
+        (a captured message, typing, a finished response) or until the generation
+        delay of the pending messages runs out.
+
         Args:
             client: The Discord client
             message: The Discord message
@@ -403,63 +488,78 @@ class discord_AI_bot:
             channel_id_str: The Discord channel ID
             session: The session data for this channel
         """
+        channel_key = f"{server_id}_{channel_id_str}"
+        activity = self.channel_events.setdefault(channel_key, asyncio.Event())
+
         try:
             while True:
-                await asyncio.sleep(0.5)
+                # Clear before inspecting state so no signal raised afterwards is lost
+                activity.clear()
+                timeout = MONITOR_IDLE_TIMEOUT
 
                 # Reload session data to get latest status
                 current_session = get_session_data(server_id, channel_id_str)
 
-                # Skip if session no longer exists
+                # Stop if session no longer exists
                 if not current_session:
                     utils.log.debug(
                         "Session no longer exists for channel %s, stopping monitor", channel_id_str)
                     break
 
-                # Skip if already awaiting response
-                if current_session.get("awaiting_response", False):
-                    continue
-
-                # Skip if channel is already being processed
-                channel_key = f"{server_id}_{channel_id_str}"
-                if channel_key in self.processing_channels:
-                    continue
+                # Wait if already awaiting a response or the channel is being processed
+                response_task = self.active_tasks.get(channel_key)
+                busy = (current_session.get("awaiting_response", False)
+                        or channel_key in self.processing_channels
+                        or (response_task is not None and not response_task.done()))
 
                 # Check for inactivity or message threshold
-                cached_data = await asyncio.to_thread(utils.read_json, "messages_cache.json") or {}
-                channel_messages = cached_data.get(
-                    server_id, {}).get(channel_id_str, {})
-                cache_count = len(channel_messages)
-
-                time_since_last = time.time() - current_session.get("last_message_time", 0)
-                delay = utils.config_yaml.get(
-                    "Options", {}).get("delay_for_generation", 5)
-
-                if ((time_since_last >= delay or cache_count >= 5) and cache_count > 0):
-                    utils.log.debug(
-                        "Inactivity detected for channel %s (%d seconds, %d messages). Triggering AI response.",
-                        channel_id_str, time_since_last, cache_count
-                    )
-
-                    # Cancel any existing response task
-                    task_key = f"{server_id}_{channel_id_str}"
-                    if task_key in self.active_tasks and not self.active_tasks[task_key].done():
-                        self.active_tasks[task_key].cancel()
-                        try:
-                            await self.active_tasks[task_key]
-                        except asyncio.CancelledError:
-                            pass
-
-                    # Create a new response task
-                    self.active_tasks[task_key] = asyncio.create_task(
-                        self.AI_send_message(client, message, channel_id_str)
-                    )
+                cache_count = utils.cached_message_count(
+                    server_id, channel_id_str)
+
+                # Back off after an attempt that left the cache untouched
+                retry_in = self.retry_after.get(
+                    channel_key, 0) - time.monotonic()
+
+                if not busy and cache_count > 0 and retry_in > 0:
+                    timeout = retry_in
+                elif not busy and cache_count > 0:
+                    time_since_last = time.time() - current_session.get("last_message_time", 0)
+                    remaining = utils.config.options.delay_for_generation - time_since_last
+
+                    if remaining <= 0 or cache_count >= 5:
+                        utils.log.debug(
+                            "Inactivity detected for channel %s (%d seconds, %d messages). Triggering AI response.",
+                            channel_id_str, time_since_last, cache_count
+                        )
+
+                        # Create a new response task and wake up once it is done
+                        response_task = asyncio.create_task(
+                            self.AI_send_message(client, message, channel_id_str)
+                        )
+                        response_task.add_done_callback(
+                            lambda _: activity.set())
+                        self.active_tasks[channel_key] = response_task
+                    else:
+                        timeout = remaining
 
-                    # Wait for the response to complete
-                    await asyncio.sleep(5)
+                try:
+                    await asyncio.wait_for(activity.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
         except asyncio.CancelledError:
             utils.log.debug(
                 "Monitor task for channel %s was cancelled", channel_id_str)
         except Exception as e:
             utils.log.error(
                 "Error in monitor_inactivity for channel %s: %s", channel_id_str, e)
+        finally:
+            # Drop this channel's bookkeeping so ended monitors don't accumulate
+            if self.channel_events.get(channel_key) is activity:
+                del self.channel_events[channel_key]
+            self.retry_after.pop(channel_key, None)
+            response_task = self.active_tasks.get(channel_key)
+            if response_task is not None and response_task.done():
+                del self.active_tasks[channel_key]
+            task_name = f"monitor_{server_id}_{channel_id_str}"
+            if self.active_tasks.get(task_name) is asyncio.current_task():
+                del self.active_tasks[task_name]
@@ -49,16 +49,17 @@ class BridgeBot(commands.Bot):
         if not os.path.exists("session.json"):
             utils.write_json("session.json", {})
 
-        # Ensure messages_cache.json exists
-        if not os.path.exists("messages_cache.json"):
-            utils.write_json("messages_cache.json", {})
-
-        # Load session cache
+        # Load session and message caches
         await load_session_cache()
+        await utils.load_messages_cache()
 
         # Start session update processor
         self.update_processor = asyncio.create_task(process_session_updates())
 
+        # Start message cache flush processor
+        self.cache_flusher = asyncio.create_task(
+            utils.process_messages_cache_flush())
+
         # Sync AI configurations for each webhook
         await AI.sync_config(self)
 
@@ -75,6 +76,20 @@ class BridgeBot(commands.Bot):
         # Ensure all pending updates are processed
         await utils.session_update_queue.join()
 
+        # Stop the message cache flush processor and persist what is left.
+        # It only exists once setup_hook loaded the cache, so an early close()
+        # never overwrites messages_cache.json with an empty cache.
+        if hasattr(self, 'cache_flusher'):
+            self.cache_flusher.cancel()
+            try:
+                await self.cache_flusher
+            except asyncio.CancelledError:
+                pass
+            await utils.flush_messages_cache()
+
+        # Close the shared HTTP session
+        await webhook.close_http_session()
+
         await super().close()
 
     async def on_ready(self):
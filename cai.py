@@ -1,7 +1,6 @@
 import asyncio
-import re
 import aiohttp
-from typing import Dict, Any, Tuple, Optional, Callable, Awaitable, TypeVar, Union, List
+from typing import Dict, Any, Tuple, Optional, Callable, Awaitable, TypeVar, Union, List, Set
 
 from PyCharacterAI import exceptions, get_client, types
 
@@ -19,6 +18,8 @@ response_queue = asyncio.Queue()
 active_response_tasks: Dict[str, asyncio.Task] = {}
 # Semaphore to limit concurrent API calls to Character.AI
 api_semaphore = asyncio.Semaphore(3)  # Allow up to 3 concurrent API calls
+# Callback tasks spawned by the response queue, kept referenced until done
+callback_tasks: Set[asyncio.Task] = set()
 
 
 async def retry_with_backoff(func: Callable[[], Awaitable[T]], max_retries: int = 3,
@@ -169,9 +170,7 @@ async def initialize_session_messages(session: Dict[str, Any], server_id: str,
         return None, None
 
     # Use existing chat_id or create a new one
-    create_new_chat = utils.config_yaml["Character_AI"].get(
-        "new_chat_on_reset", False)
-    chat_id, greeting_obj = await new_chat_id(create_new_chat, session, server_id, channel_id)
+    chat_id, greeting_obj = await new_chat_id(utils.config.character_ai.new_chat_on_reset, session, server_id, channel_id)
 
     if chat_id is None:
         utils.log.critical(
@@ -187,9 +186,8 @@ async def initialize_session_messages(session: Dict[str, Any], server_id: str,
                 greeting_message = greeting_obj.get_primary_candidate().text
                 utils.log.debug(
                     "Character greeting message for channel %s: %s", channel_id, greeting_message)
-                for pattern in utils.config_yaml.get("MessageFormatting", {}).get("remove_IA_text_from", []):
-                    greeting_message = re.sub(
-                        pattern, '', greeting_message, flags=re.MULTILINE).strip()
+                greeting_message = utils.strip_patterns(
+                    greeting_message, utils.config.formatting.remove_IA_text_from)
     except Exception as e:
         utils.log.critical(
             "Error during chat session initialization for channel %s: %s", channel_id, e)
@@ -205,9 +203,8 @@ async def initialize_session_messages(session: Dict[str, Any], server_id: str,
                 system_msg_reply = system_reply_obj.get_primary_candidate().text
                 utils.log.debug(
                     "Character response to system prompt for channel %s: %s", channel_id, system_msg_reply)
-                for pattern in utils.config_yaml.get("MessageFormatting", {}).get("remove_IA_text_from", []):
-                    system_msg_reply = re.sub(
-                        pattern, '', system_msg_reply, flags=re.MULTILINE).strip()
+                system_msg_reply = utils.strip_patterns(
+                    system_msg_reply, utils.config.formatting.remove_IA_text_from)
         except Exception as e:
             utils.log.error(
                 "Error sending system message for channel %s: %s", channel_id, e)
@@ -218,7 +215,7 @@ async def initialize_session_messages(session: Dict[str, Any], server_id: str,
     return greeting_message, system_msg_reply
 
 
-async def cai_response(messages: Dict[str, Any], message,
+async def cai_response(messages: Dict[str, Any], server_id: str, channel_id: str,
                        chat_id: Optional[str] = None,
                        character_id: Optional[str] = None) -> str:
     """
@@ -226,7 +223,8 @@ async def cai_response(messages: Dict[str, Any], message,
 
     Args:
         messages: The cached messages to send to the AI
-        message: The Discord message object
+        server_id: The Discord server ID
+        channel_id: The Discord channel ID
         chat_id: The Character.AI chat ID
         character_id: The Character.AI character ID
 
@@ -253,7 +251,7 @@ async def cai_response(messages: Dict[str, Any], message,
                 global answer, AI_response
 
                 formatted_data = utils.format_to_send(
-                    messages, message.guild.id, message.channel.id)
+                    messages, server_id, channel_id)
                 if not formatted_data:
                     utils.log.warning("No formatted data to send to AI")
                     AI_response = "I couldn't process your message. Please try again."
@@ -298,8 +296,6 @@ async def cai_response(messages: Dict[str, Any], message,
                 utils.log.info(f"New chat created with ID: {chat_id}")
 
                 # Update session with new chat_id
-                server_id = str(message.guild.id)
-                channel_id = str(message.channel.id)
                 session = utils.get_session_data(server_id, channel_id)
                 if session:
                     session["chat_id"] = chat_id
@@ -316,9 +312,8 @@ async def cai_response(messages: Dict[str, Any], message,
 
     finally:
         # Clean up the response by removing unwanted patterns
-        for pattern in utils.config_yaml.get("MessageFormatting", {}).get("remove_IA_text_from", []):
-            AI_response = re.sub(pattern, '', AI_response,
-                                 flags=re.MULTILINE).strip()
+        AI_response = utils.strip_patterns(
+            AI_response, utils.config.formatting.remove_IA_text_from)
         try:
             if client:
                 await client.close_session()
@@ -329,10 +324,52 @@ async def cai_response(messages: Dict[str, Any], message,
     return AI_response
 
 
+async def _run_callback(callback: Callable[[str, Optional[Dict[str, str]]], Awaitable[None]],
+                        response: str, consumed: Optional[Dict[str, str]],
+                        channel_id: str) -> None:
+    """
+    Run a response callback outside the queue processor.
+
+    Args:
+        callback: Async function to call with the response
+        response: The AI's response
+        consumed: Cached messages that were sent to the AI, or None if unknown
+        channel_id: Channel ID, used for logging
+    """
+    try:
+        await callback(response, consumed)
+    except Exception as e:
+        utils.log.error(
+            f"Error in response callback for channel {channel_id}: {e}")
+    finally:
+        utils.log.debug("Completed response for channel %s", channel_id)
+
+
+def _dispatch_callback(callback: Callable[[str, Optional[Dict[str, str]]], Awaitable[None]],
+                       response: str, consumed: Optional[Dict[str, str]],
+                       channel_id: str) -> None:
+    """
+    Schedule a response callback so sending never blocks the next AI request.
+
+    Args:
+        callback: Async function to call with the response
+        response: The AI's response
+        consumed: Cached messages that were sent to the AI, or None if unknown
+        channel_id: Channel ID, used for logging
+    """
+    task = asyncio.create_task(_run_callback(
+        callback, response, consumed, channel_id))
+    callback_tasks.add(task)
+    task.add_done_callback(callback_tasks.discard)
+
+
 async def process_response_queue():
     """
     Background task to process the response queue.
     Ensures that multiple responses are handled in order without overwhelming the API.
+
+    Only the AI request itself is serialized; the callbacks that deliver the
+    responses to Discord run as separate tasks.
     """
     utils.log.info("Starting response queue processor")
     while True:
@@ -340,41 +377,41 @@ async def process_response_queue():
             task_data = await response_queue.get()
             server_id = task_data["server_id"]
             channel_id = task_data["channel_id"]
-            message = task_data["message"]
             chat_id = task_data["chat_id"]
             character_id = task_data["character_id"]
             callback = task_data["callback"]
 
-            utils.log.debug(f"Processing response for channel {channel_id}")
+            utils.log.debug("Processing response for channel %s", channel_id)
             utils.log.debug(
-                f"Generating AI response with chat_id: {chat_id}, character_id: {character_id}")
+                "Generating AI response with chat_id: %s, character_id: %s", chat_id, character_id)
 
+            consumed = None
             try:
-                # Get cached messages
-                cached_data = await asyncio.to_thread(utils.read_json, "messages_cache.json") or {}
+                # Snapshot what is sent so only these entries are cleared later
+                consumed = dict(utils.messages_cache.get(
+                    server_id, {}).get(channel_id, {}))
+                cached_data = {server_id: {channel_id: consumed}}
 
                 # Generate response
                 response = await cai_response(
                     cached_data,
-                    message,
+                    server_id,
+                    channel_id,
                     chat_id=chat_id,
                     character_id=character_id
                 )
 
-                # Execute callback with response
-                await callback(response)
+                # Deliver the response without holding up the queue
+                _dispatch_callback(callback, response, consumed, channel_id)
             except Exception as e:
                 utils.log.error(
                     f"Error processing response for channel {channel_id}: {e}")
                 # Try to notify the callback about the error
-                try:
-                    await callback(f"I'm sorry, but I encountered an error: {str(e)}")
-                except Exception:
-                    pass
+                _dispatch_callback(
+                    callback, f"I'm sorry, but I encountered an error: {str(e)}", consumed, channel_id)
             finally:
                 # Mark task as done
                 response_queue.task_done()
-                utils.log.debug(f"Completed response for channel {channel_id}")
 
                 # Small delay to prevent API rate limiting
                 await asyncio.sleep(0.5)
@@ -389,26 +426,25 @@ async def process_response_queue():
             await asyncio.sleep(1)
 
 
-async def queue_response(server_id: str, channel_id: str, message,
+async def queue_response(server_id: str, channel_id: str,
                          chat_id: str, character_id: str,
-                         callback: Callable[[str], Awaitable[None]]) -> None:
+                         callback: Callable[[str, Optional[Dict[str, str]]], Awaitable[None]]) -> None:
     """
     Queue a response request to be processed.
 
     Args:
         server_id: Server ID
         channel_id: Channel ID
-        message: Discord message object
         chat_id: Character.AI chat ID
         character_id: Character.AI character ID
-        callback: Async function to call with the response
+        callback: Async function to call with the response and the cached
+            messages that were sent to the AI
     """
     await response_queue.put({
         "server_id": server_id,
         "channel_id": channel_id,
-        "message": message,
         "chat_id": chat_id,
         "character_id": character_id,
         "callback": callback
     })
-    utils.log.debug(f"Queued response request for channel {channel_id}")
+    utils.log.debug("Queued response request for channel %s", channel_id)
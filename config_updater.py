@@ -1,4 +1,5 @@
 import os
+from copy import deepcopy
 
 from ruamel.yaml import YAML
 from ruamel.yaml.comments import CommentedMap
@@ -120,6 +121,13 @@ MessageFormatting:
   # Modify it to your advantage
 """
 
+# Parsed once; each ConfigManager works on its own deep copy
+_DEFAULT_PARSED = yaml.load(DEFAULT_CONFIG_CONTENT)
+
+
+# Sentinel for keys missing from the user configuration
+_MISSING = object()
+
 
 def merge_ordered(user_cfg, default_cfg):
     """
@@ -135,25 +143,30 @@ def merge_ordered(user_cfg, default_cfg):
     Additionally, comment attributes (if present) are preserved from either configuration.
     """
     merged = CommentedMap()
+    # Resolve the comment tables once instead of on every key
+    user_comments = user_cfg.ca.items if hasattr(user_cfg, 'ca') else {}
+    default_comments = default_cfg.ca.items if hasattr(
+        default_cfg, 'ca') else {}
+
     for key, default_val in default_cfg.items():
-        # If the user configuration contains the key, process its value
-        if key in user_cfg:
-            user_val = user_cfg[key]
-            # If both default and user values are dictionaries, merge them recursively
-            if isinstance(default_val, dict) and isinstance(user_val, dict):
-                merged[key] = merge_ordered(user_val, default_val)
-            else:
-                # Use the user's value if it's not a dictionary or cannot be merged recursively
-                merged[key] = user_val
-        else:
+        # A single lookup tells both whether the key exists and its value
+        user_val = user_cfg.get(key, _MISSING)
+        if user_val is _MISSING:
             # If the key is missing in the user configuration, use the default value
             merged[key] = default_val
+        elif isinstance(default_val, dict) and isinstance(user_val, dict):
+            # If both default and user values are dictionaries, merge them recursively
+            merged[key] = merge_ordered(user_val, default_val)
+        else:
+            # Use the user's value if it's not a dictionary or cannot be merged recursively
+            merged[key] = user_val
 
         # Preserve comment attributes if available in user_cfg; otherwise, fall back to default_cfg comments
-        if hasattr(user_cfg, 'ca') and key in user_cfg.ca.items:
-            merged.ca.items[key] = user_cfg.ca.items.get(key)
-        elif hasattr(default_cfg, 'ca') and key in default_cfg.ca.items:
-            merged.ca.items[key] = default_cfg.ca.items.get(key)
+        comment = user_comments.get(key)
+        if comment is None:
+            comment = default_comments.get(key)
+        if comment is not None:
+            merged.ca.items[key] = comment
     return merged
 
 
@@ -162,11 +175,11 @@ class ConfigManager:
         """
         Initializes the configuration manager.
 
-        - Loads the default configuration from DEFAULT_CONFIG_CONTENT.
+        - Copies the default configuration parsed from DEFAULT_CONFIG_CONTENT.
         - Attempts to load the user configuration from the given file.
         """
         self.config_file = config_file
-        self.default_config = yaml.load(DEFAULT_CONFIG_CONTENT)
+        self.default_config = deepcopy(_DEFAULT_PARSED)
         self.user_config = self.load_user_config()
 
     def load_user_config(self):
@@ -238,6 +251,7 @@ class ConfigManager:
             try:
                 with open(self.config_file, "w", encoding="utf-8") as f:
                     yaml.dump(self.default_config, f)
+                self.user_config = self.default_config
                 utils.log.info(
                     "Configuration file '%s' created successfully!", self.config_file)
             except Exception as e:
@@ -252,6 +266,7 @@ class ConfigManager:
             try:
                 with open(self.config_file, "w", encoding="utf-8") as f:
                     yaml.dump(updated_config, f)
+                self.user_config = updated_config
                 utils.log.info(
                     "Configuration file '%s' updated successfully!", self.config_file)
             except Exception as e:
@@ -3,12 +3,13 @@ import re
 import sys
 import time
 import zipfile
+import shutil
 import asyncio
 import subprocess
-from io import BytesIO
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 from colorama import Fore, init, Style
 from packaging import version
 
@@ -19,10 +20,17 @@ if not os.path.exists("version.txt"):
     with open("version.txt", "w") as file:
         file.write("1.0.9\n")
 
-if not os.path.exists("cache.json"):
-    with open("cache.json", "w") as file:
+# Stores the last GitHub release response together with its ETag
+UPDATE_CACHE_FILE = "cache.json"
+
+if not os.path.exists(UPDATE_CACHE_FILE):
+    with open(UPDATE_CACHE_FILE, "w") as file:
         file.write("{}")
 
+# Pooled session so the release check and the download reuse connections
+gh_session = requests.Session()
+gh_session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
@@ -73,11 +81,26 @@ class AutoUpdater:
         return match.group(1), match.group(2)
 
     def _get_latest_release(self):
+        url = f"{self.base_url}/releases/latest"
+        cache = utils.read_json(UPDATE_CACHE_FILE) or {}
+        cached_release = cache.get("latest_release") or {}
+        headers = dict(self.headers)
+        if cached_release.get("url") == url and cached_release.get("etag"):
+            headers["If-None-Match"] = cached_release["etag"]
+
         try:
-            response = requests.get(
-                f"{self.base_url}/releases/latest", headers=self.headers)
-            if response.status_code == 200:
-                return response.json()
+            response = gh_session.get(url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                utils.log.debug("Latest release unchanged since last check.")
+                return cached_release.get("data")
+            elif response.status_code == 200:
+                release = response.json()
+                etag = response.headers.get("ETag")
+                if etag:
+                    cache["latest_release"] = {
+                        "url": url, "etag": etag, "data": release}
+                    utils.write_json(UPDATE_CACHE_FILE, cache)
+                return release
             else:
                 utils.log.error(
                     "Failed to fetch latest release: Status code %s", response.status_code)
@@ -86,10 +109,24 @@ class AutoUpdater:
             utils.log.error("Error fetching release: %s", e)
             return None
 
+    def _download(self, url, destination):
+        """
+        Streams a download straight to disk, one chunk at a time.
+
+        :param url: URL to download
+        :param destination: Path of the file to write
+        """
+        with gh_session.get(url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(destination, "wb") as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+
     def _update_exe(self, release_data):
         utils.log.info("New update found, downloading...")
 
         new_version = release_data.get('tag_name', self.current_version)
+        temp_exe = self.exe_path.parent / "Bridge_new.exe"
         # Try to find an .exe asset first
         asset = next((a for a in release_data.get('assets', [])
                      if a.get('name', '').endswith('.exe')), None)
@@ -100,57 +137,49 @@ class AutoUpdater:
             if asset:
                 utils.log.info(
                     "Zip asset found for update, processing zip file...")
+                temp_zip = self.exe_path.parent / "Bridge_update.zip"
                 try:
-                    download_url = asset['browser_download_url']
-                    zip_content = requests.get(download_url).content
-                    zip_file = zipfile.ZipFile(BytesIO(zip_content))
-                    exe_filename = None
-                    for file in zip_file.namelist():
-                        if file.endswith('.exe'):
-                            exe_filename = file
-                            break
-                    if exe_filename is None:
-                        utils.log.error(
-                            "No .exe file found in the zip archive.")
-                        return
-                    new_exe_content = zip_file.read(exe_filename)
-                    self._apply_update(new_exe_content, new_version)
+                    self._download(asset['browser_download_url'], temp_zip)
+                    with zipfile.ZipFile(temp_zip) as zip_file:
+                        exe_filename = next(
+                            (name for name in zip_file.namelist() if name.endswith('.exe')), None)
+                        if exe_filename is None:
+                            utils.log.error(
+                                "No .exe file found in the zip archive.")
+                            return
+                        with zip_file.open(exe_filename) as src, open(temp_exe, "wb") as dst:
+                            shutil.copyfileobj(src, dst, length=1 << 20)
                 except Exception as e:
                     utils.log.error("Update via zip failed: %s", e)
+                    return
+                finally:
+                    temp_zip.unlink(missing_ok=True)
+                self._apply_update(temp_exe, new_version)
                 return
             else:
                 utils.log.error(
                     "No suitable asset found for update (neither .exe nor .zip)")
                 return
         try:
-            download_url = asset['browser_download_url']
-            new_exe_content = requests.get(download_url).content
-            self._apply_update(new_exe_content, new_version)
+            self._download(asset['browser_download_url'], temp_exe)
         except Exception as e:
             utils.log.error("Executable update failed: %s", e)
+            return
+        self._apply_update(temp_exe, new_version)
 
-    def _apply_update(self, new_exe_content, new_version):
+    def _apply_update(self, temp_exe, new_version):
         """
-        Saves the new executable content to a temporary file and creates an update batch script
-        that replaces the current executable with the new one and updates version.txt.
+        Creates an update batch script that replaces the current executable with the
+        already downloaded one, updates version.txt and then deletes itself.
         """
         utils.log.info("Switching to the latest executable file...")
-        temp_exe = self.exe_path.parent / "Bridge_new.exe"
-        try:
-            with open(temp_exe, "wb") as f:
-                f.write(new_exe_content)
-        except Exception as e:
-            utils.log.error("Failed to write temporary executable file: %s", e)
-            return
-
         version_file = self.exe_path.parent / "version.txt"
         update_script = f"""@echo off
 timeout /t 3 /nobreak >nul
-del "{self.exe_path}"
 move /Y "{temp_exe}" "{self.exe_path}"
 echo {new_version} > "{version_file}"
 start "" "{self.exe_path}"
-exit
+del "%~f0"
     """
         try:
             with open("update.bat", "w", encoding="utf-8") as f:
@@ -216,7 +245,9 @@ def startup_screen():
 {Style.RESET_ALL}
 """
     print(banner)
-    time.sleep(2)
+    # Keep the banner on screen only when explicitly requested
+    if "--splash" in sys.argv:
+        time.sleep(2)
 
 
 async def boot():
@@ -225,6 +256,8 @@ async def boot():
     # Manage and update the configuration file
     config_manager = ConfigManager()
     await config_manager.check_and_update()
+    # Reuse the configuration ConfigManager already parsed and wrote
+    utils.reload_config(config_manager.user_config)
 
     # Initialize AutoUpdater using configuration data
     updater = AutoUpdater(
@@ -1,15 +1,28 @@
 import asyncio
+import atexit
+import copy
 import datetime
 import json
 import logging
+import logging.handlers
+import os
+import queue
 import re
-import socket
 import threading
+from types import SimpleNamespace
 from typing import Any, Dict, Optional, Callable, Awaitable, TypeVar, Union
 
 import yaml
 from colorama import Fore, init
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
+# Use libyaml's C loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Type definitions
 T = TypeVar('T')
 SessionData = Dict[str, Any]
@@ -47,37 +60,159 @@ def load_config() -> Dict[str, Any]:
     """
     try:
         with open("config.yml", "r", encoding="utf-8") as file:
-            data = yaml.safe_load(file)
+            data = yaml.load(file, Loader=YAML_LOADER)
     except Exception:
         data = {}  # Return an empty dictionary on error
     return data
 
 
+def to_plain(value: Any) -> Any:
+    """
+    Converts round-trip YAML data (e.g. ruamel's CommentedMap and scalar
+    subclasses) into plain Python containers and scalars.
+
+    Args:
+        value: Parsed YAML value
+
+    Returns:
+        Any: The same data built from dict, list, str, int, float and bool
+    """
+    if isinstance(value, dict):
+        return {str(k): to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(v) for v in value]
+    # bool first, since it is a subclass of int
+    for plain_type in (bool, int, float, str):
+        if isinstance(value, plain_type):
+            return plain_type(value)
+    return value
+
+
+def compile_patterns(patterns, invalid: list) -> tuple:
+    """
+    Compiles text removal patterns from the configuration, skipping invalid ones.
+
+    Args:
+        patterns: Iterable of regex pattern strings
+        invalid: List that collects (pattern, error) pairs for patterns that failed to compile
+
+    Returns:
+        tuple: Compiled patterns, in their original order
+    """
+    compiled = []
+    for pattern in patterns or ():
+        try:
+            compiled.append(re.compile(pattern, flags=re.MULTILINE))
+        except re.error as e:
+            invalid.append((pattern, e))
+    return tuple(compiled)
+
+
+def strip_patterns(text: str, patterns) -> str:
+    """
+    Removes every match of the given compiled patterns from the text.
+
+    Args:
+        text: Text to process
+        patterns: Compiled patterns, applied in order
+
+    Returns:
+        str: Processed text
+    """
+    for pattern in patterns:
+        text = pattern.sub('', text).strip()
+    return text
+
+
+def build_runtime_config(data: Dict[str, Any]) -> SimpleNamespace:
+    """
+    Builds a plain snapshot of the settings read on hot paths, with defaults applied.
+
+    Args:
+        data: Configuration data from config.yml
+
+    Returns:
+        SimpleNamespace: Snapshot grouped by section (discord, character_ai, options, formatting)
+    """
+    discord_cfg = data.get("Discord", {}) or {}
+    character_ai = data.get("Character_AI", {}) or {}
+    options = data.get("Options", {}) or {}
+    formatting = data.get("MessageFormatting", {}) or {}
+    remove_emojis = formatting.get("remove_emojis", {}) or {}
+    # Reported by log_invalid_patterns() once logging is configured
+    invalid_patterns = []
+
+    return SimpleNamespace(
+        discord=SimpleNamespace(
+            messages_cache=discord_cfg.get(
+                "messages_cache", "messages_cache.json"),
+        ),
+        character_ai=SimpleNamespace(
+            new_chat_on_reset=bool(
+                character_ai.get("new_chat_on_reset", False)),
+        ),
+        options=SimpleNamespace(
+            delay_for_generation=options.get("delay_for_generation", 5),
+            send_message_line_by_line=bool(
+                options.get("send_message_line_by_line", False)),
+        ),
+        formatting=SimpleNamespace(
+            remove_user_emojis=bool(remove_emojis.get("user", False)),
+            remove_ai_emojis=bool(remove_emojis.get("AI", False)),
+            user_format_syntax=formatting.get(
+                "user_format_syntax", "{message}"),
+            user_reply_format_syntax=formatting.get(
+                "user_reply_format_syntax", "{message}"),
+            remove_user_text_from=compile_patterns(
+                formatting.get("remove_user_text_from", []), invalid_patterns),
+            remove_IA_text_from=compile_patterns(
+                formatting.get("remove_IA_text_from", []), invalid_patterns),
+            invalid_patterns=tuple(invalid_patterns),
+        ),
+    )
+
+
+def log_invalid_patterns(runtime_config: SimpleNamespace) -> None:
+    """
+    Warns about text removal patterns that were skipped because they failed to compile.
+
+    Args:
+        runtime_config: Snapshot built by build_runtime_config()
+    """
+    for pattern, error in runtime_config.formatting.invalid_patterns:
+        log.warning(
+            "Ignoring invalid MessageFormatting pattern %r: %s", pattern, error)
+
+
 def setup_logging(debug_mode=False) -> logging.Logger:
     """
     Configures logging: sets up a file handler and a console handler with colors.
 
+    Records are put on a queue and written by a background listener thread,
+    so logging from the event loop never waits on disk or console I/O.
+
     Args:
         debug_mode (bool): Whether to enable debug logging to console
 
     Returns:
         logging.Logger: Configured root logger
     """
+    global log_listener
+
     # Initialize colorama with autoreset enabled
     init(autoreset=True)
 
-    # Remove any existing handlers to ensure basicConfig applies correctly
+    # Stop a previous listener and remove any existing handlers
+    if log_listener is not None:
+        log_listener.stop()
     for handler in logging.root.handlers[:]:
         logging.root.removeHandler(handler)
 
     # Configure file logging
-    logging.basicConfig(
-        level=logging.DEBUG,            # Global logging level
-        filename="app.log",             # Log file name
-        filemode="a",                   # Append mode
-        format="[%(filename)s] %(levelname)s : %(message)s",
-        encoding="utf-8",
-    )
+    file_handler = logging.FileHandler(
+        "app.log", mode="a", encoding="utf-8")  # Append mode
+    file_handler.setFormatter(logging.Formatter(
+        "[%(filename)s] %(levelname)s : %(message)s"))
 
     # Create a console handler with colors
     console_handler = logging.StreamHandler()
@@ -89,27 +224,52 @@ def setup_logging(debug_mode=False) -> logging.Logger:
 
     console_handler.setFormatter(ColoredFormatter())
 
-    # Add the console handler to the root logger
+    # Route every record through a queue to the real handlers
+    log_queue = queue.Queue(-1)
     root_logger = logging.getLogger()
-    root_logger.addHandler(console_handler)
+    root_logger.setLevel(logging.DEBUG)  # Global logging level
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True)
+    log_listener.start()
 
     return root_logger
 
 
 # First, load the configuration without logging to avoid premature logger creation
 config_yaml = load_config()
+config = build_runtime_config(config_yaml)
 debug_mode = config_yaml.get("Options", {}).get("debug_mode", False)
 
 # Next, configure logging
+log_listener: Optional[logging.handlers.QueueListener] = None
 log = setup_logging(debug_mode)
+# Flush queued records before the interpreter exits
+atexit.register(lambda: log_listener.stop())
+log_invalid_patterns(config)
 
 # Session management
 session_cache: Dict[str, Any] = {}
 session_update_queue = asyncio.Queue()
-session_lock = threading.Lock()
+session_lock = threading.RLock()
 
-# Add this configuration to your config.yml file
-config_yaml = load_config()
+# Message cache, kept in memory and flushed to disk in the background
+messages_cache: CacheData = {}
+messages_cache_dirty = asyncio.Event()
+
+
+def reload_config(data: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Refreshes the configuration, e.g. after ConfigManager created or updated it.
+
+    Args:
+        data: Already parsed configuration to use; config.yml is read again if None
+    """
+    global config_yaml, config
+    config_yaml = to_plain(data) if data is not None else load_config()
+    config = build_runtime_config(config_yaml)
+    log_invalid_patterns(config)
 
 
 async def timeout_async(func: Callable[[], Awaitable[T]], timeout: float,
@@ -134,6 +294,25 @@ async def timeout_async(func: Callable[[], Awaitable[T]], timeout: float,
             log.error("Error in on_timeout handler: %s", e)
 
 
+# Regex pattern for Unicode emojis
+EMOJI_PATTERN = re.compile(
+    "[\U0001F600-\U0001F64F"  # Emoticons
+    "\U0001F300-\U0001F5FF"   # Symbols & pictographs
+    "\U0001F680-\U0001F6FF"   # Transport & map symbols
+    "\U0001F700-\U0001F77F"   # Alchemical symbols
+    "\U0001F780-\U0001F7FF"   # Geometric shapes extended
+    "\U0001F800-\U0001F8FF"   # Supplemental arrows-C
+    "\U0001F900-\U0001F9FF"   # Supplemental symbols and pictographs
+    "\U0001FA00-\U0001FA6F"   # Chess symbols, etc.
+    "\U0001FA70-\U0001FAFF"   # Symbols and pictographs extended-A
+    "\U00002702-\U000027B0"   # Dingbats
+    "\U000024C2-\U0001F251"   # Enclosed characters
+    "]+", flags=re.UNICODE)
+
+# Regex pattern for Discord custom emojis (static and animated)
+DISCORD_EMOJI_PATTERN = re.compile(r"<a?:\w+:\d+>")
+
+
 def remove_emoji(text: str) -> str:
     """
     Removes emoji characters from the given text, including Discord custom emojis.
@@ -144,47 +323,13 @@ def remove_emoji(text: str) -> str:
     Returns:
         str: Text with emojis removed
     """
-    # Regex pattern for Unicode emojis
-    emoji_pattern = re.compile(
-        "[\U0001F600-\U0001F64F"  # Emoticons
-        "\U0001F300-\U0001F5FF"   # Symbols & pictographs
-        "\U0001F680-\U0001F6FF"   # Transport & map symbols
-        "\U0001F700-\U0001F77F"   # Alchemical symbols
-        "\U0001F780-\U0001F7FF"   # Geometric shapes extended
-        "\U0001F800-\U0001F8FF"   # Supplemental arrows-C
-        "\U0001F900-\U0001F9FF"   # Supplemental symbols and pictographs
-        "\U0001FA00-\U0001FA6F"   # Chess symbols, etc.
-        "\U0001FA70-\U0001FAFF"   # Symbols and pictographs extended-A
-        "\U00002702-\U000027B0"   # Dingbats
-        "\U000024C2-\U0001F251"   # Enclosed characters
-        "]+", flags=re.UNICODE)
-
-    # Regex pattern for Discord custom emojis (static and animated)
-    discord_emoji_pattern = re.compile(r"<a?:\w+:\d+>")
-
     # Remove all emojis from the text
-    text = re.sub(emoji_pattern, "", text)
-    text = re.sub(discord_emoji_pattern, "", text)
+    text = EMOJI_PATTERN.sub("", text)
+    text = DISCORD_EMOJI_PATTERN.sub("", text)
 
     return text.strip()
 
 
-def test_internet() -> bool:
-    """
-    Tests internet connectivity by attempting to connect to www.google.com.
-
-    Returns:
-        bool: True if successful, otherwise False
-    """
-    try:
-        socket.create_connection(("www.google.com", 80), timeout=5)
-        log.debug("Internet connection test succeeded.")
-        return True
-    except OSError as e:
-        log.error("Internet connection test failed: %s", e)
-        return False
-
-
 def is_channel_active(server_id: str, channel_id: str) -> bool:
     """
     Check if a channel is still active in the session data.
@@ -201,7 +346,7 @@ def is_channel_active(server_id: str, channel_id: str) -> bool:
 
 def capture_message(message_info, reply_message=None) -> None:
     """
-    Captures a message from a specified channel and stores it in the messages_cache.json file.
+    Captures a message from a specified channel and stores it in the in-memory message cache.
     Prevents duplicate messages from being added to the cache.
 
     Args:
@@ -212,10 +357,7 @@ def capture_message(message_info, reply_message=None) -> None:
     if getattr(message_info, "webhook_id", None):
         return
 
-    # Read existing cache data
-    dados = read_json("messages_cache.json")
-    if dados is None:
-        dados = {}
+    dados = messages_cache
 
     # Extract server_id and channel_id from message_info
     server_id = str(message_info.guild.id)
@@ -232,51 +374,53 @@ def capture_message(message_info, reply_message=None) -> None:
         dados[server_id][channel_id] = {}
 
     # Retrieve format templates from configuration
-    template_syntax = config_yaml.get("MessageFormatting", {}).get(
-        "user_format_syntax", "{message}")
-    reply_template_syntax = config_yaml.get("MessageFormatting", {}).get(
-        "user_reply_format_syntax", "{message}")
+    formatting = config.formatting
+    template_syntax = formatting.user_format_syntax
+    reply_template_syntax = formatting.user_reply_format_syntax
+
+    # Only plain strings from the author are kept, never the discord.User itself
+    author = message_info.author
+    username = str(author.name)
+    display_name = str(author.global_name or author.name)
 
     # Process message content and author name based on emoji removal configuration
-    if config_yaml["MessageFormatting"]["remove_emojis"]["user"]:
+    if formatting.remove_user_emojis:
         msg_text = remove_emoji(message_info.content)
-        msg_name = remove_emoji(
-            message_info.author.global_name or message_info.author.name)
+        msg_name = remove_emoji(display_name)
     else:
         msg_text = message_info.content
-        msg_name = message_info.author.global_name or message_info.author.name
+        msg_name = display_name
 
     # Prepare data for formatting
     syntax = {
         "time": datetime.datetime.now().strftime("%H:%M"),
-        "username": message_info.author.name,
+        "username": username,
         "name": msg_name,
         "message": msg_text,
     }
 
     # Remove unwanted text patterns from message content
-    for pattern in config_yaml.get("MessageFormatting", {}).get("remove_user_text_from", []):
-        syntax["message"] = re.sub(
-            pattern, '', syntax["message"], flags=re.MULTILINE).strip()
+    syntax["message"] = strip_patterns(
+        syntax["message"], formatting.remove_user_text_from)
 
     # Process reply message if provided
     if reply_message:
-        if config_yaml["MessageFormatting"]["remove_emojis"]["user"]:
+        reply_author = reply_message.author
+        reply_display_name = str(reply_author.global_name or reply_author.name)
+        if formatting.remove_user_emojis:
             reply_text = remove_emoji(reply_message.content)
-            reply_name = remove_emoji(
-                reply_message.author.global_name or reply_message.author.name)
+            reply_name = remove_emoji(reply_display_name)
         else:
             reply_text = reply_message.content
-            reply_name = reply_message.author.global_name or reply_message.author.name
+            reply_name = reply_display_name
 
         syntax.update({
-            "reply_username": reply_message.author.name,
+            "reply_username": str(reply_author.name),
             "reply_name": reply_name,
             "reply_message": reply_text,
         })
-        for pattern in config_yaml.get("MessageFormatting", {}).get("remove_user_text_from", []):
-            syntax["reply_message"] = re.sub(
-                pattern, '', syntax["reply_message"], flags=re.MULTILINE).strip()
+        syntax["reply_message"] = strip_patterns(
+            syntax["reply_message"], formatting.remove_user_text_from)
 
     # Group messages if the last one was from the same user
     try:
@@ -303,8 +447,11 @@ def capture_message(message_info, reply_message=None) -> None:
                 if last_key and "Message" in last_key and last_message.endswith(syntax["name"]):
                     dados[server_id][channel_id][last_key] += f"\n{formatted_message}"
                 else:
-                    new_key = f"Message{len(channel_data) + 1}"
-                    dados[server_id][channel_id][new_key] = formatted_message
+                    # Entries may have been partially removed, so pick a free key
+                    index = len(channel_data) + 1
+                    while f"Message{index}" in channel_data:
+                        index += 1
+                    dados[server_id][channel_id][f"Message{index}"] = formatted_message
                 log.debug("Captured new message for channel %s: %s",
                           channel_id, formatted_message)
 
@@ -320,7 +467,21 @@ def capture_message(message_info, reply_message=None) -> None:
         log.error(
             "Error while saving message to cache for channel %s: %s", channel_id, e)
 
-    write_json("messages_cache.json", dados)
+    messages_cache_dirty.set()
+
+
+def cached_message_count(server_id: str, channel_id: str) -> int:
+    """
+    Returns the number of cached entries for a specific channel.
+
+    Args:
+        server_id: Server ID
+        channel_id: Channel ID
+
+    Returns:
+        int: Number of cached entries
+    """
+    return len(messages_cache.get(server_id, {}).get(channel_id, {}))
 
 
 def format_to_send(cache_data: CacheData, server_id: str, channel_id: str) -> str:
@@ -362,6 +523,37 @@ def format_to_send(cache_data: CacheData, server_id: str, channel_id: str) -> st
     return combined_message
 
 
+def dumps_json(data: Dict[str, Any]) -> bytes:
+    """
+    Serializes data to UTF-8 encoded JSON, using orjson when available.
+
+    Args:
+        data: Data to serialize
+
+    Returns:
+        bytes: Encoded JSON document
+    """
+    # Both paths produce the same layout: 2-space indent and a trailing newline
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def loads_json(raw: bytes) -> Any:
+    """
+    Parses a UTF-8 encoded JSON document, using orjson when available.
+
+    Args:
+        raw: Encoded JSON document
+
+    Returns:
+        Any: Parsed data
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
 def read_json(file_path: str) -> Optional[Dict[str, Any]]:
     """
     Reads and returns the content of a JSON file.
@@ -374,14 +566,14 @@ def read_json(file_path: str) -> Optional[Dict[str, Any]]:
     """
     with session_lock:
         try:
-            with open(file_path, 'r', encoding="utf-8") as file:
-                return json.load(file)
+            with open(file_path, 'rb') as file:
+                return loads_json(file.read())
         except FileNotFoundError:
             log.warning(
                 "JSON file '%s' not found. Creating new file.", file_path)
             write_json(file_path, {})
             return {}
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError):
             log.error(
                 "Error decoding JSON file '%s'. Creating new file.", file_path)
             write_json(file_path, {})
@@ -394,6 +586,8 @@ def read_json(file_path: str) -> Optional[Dict[str, Any]]:
 def write_json(file_path: str, data: Dict[str, Any]) -> None:
     """
     Writes the provided data to a JSON file.
+    The data is written to a temporary file first and then moved into place,
+    so the file is never left half-written.
 
     Args:
         file_path: Path to the JSON file
@@ -401,8 +595,10 @@ def write_json(file_path: str, data: Dict[str, Any]) -> None:
     """
     with session_lock:
         try:
-            with open(file_path, 'w', encoding="utf-8") as file:
-                json.dump(data, file, ensure_ascii=False, indent=4)
+            temp_path = f"{file_path}.tmp"
+            with open(temp_path, 'wb') as file:
+                file.write(dumps_json(data))
+            os.replace(temp_path, file_path)
         except Exception as e:
             log.error("Error saving JSON file '%s': %s", file_path, e)
 
@@ -414,6 +610,35 @@ async def load_session_cache() -> None:
     log.info(f"Loaded session cache with {len(session_cache)} servers")
 
 
+async def load_messages_cache() -> None:
+    """Loads cached messages from disk into memory"""
+    messages_cache.clear()
+    messages_cache.update(await asyncio.to_thread(read_json, config.discord.messages_cache) or {})
+    log.info(f"Loaded message cache with {len(messages_cache)} servers")
+
+
+async def flush_messages_cache() -> None:
+    """Writes the in-memory message cache to disk"""
+    messages_cache_dirty.clear()
+    snapshot = copy.deepcopy(messages_cache)
+    await asyncio.to_thread(write_json, config.discord.messages_cache, snapshot)
+
+
+async def process_messages_cache_flush() -> None:
+    """Background task that persists the message cache at most every 500ms"""
+    log.info("Starting message cache flush processor")
+    while True:
+        try:
+            await messages_cache_dirty.wait()
+            # Debounce: group every change made in this window into one write
+            await asyncio.sleep(0.5)
+            await flush_messages_cache()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"Error in process_messages_cache_flush: {e}")
+
+
 async def process_session_updates() -> None:
     """Background task to process session updates from the queue"""
     log.info("Starting session update processor")
@@ -421,7 +646,7 @@ async def process_session_updates() -> None:
         try:
             server_id, channel_id, new_data = await session_update_queue.get()
             log.debug(
-                f"Processing session update for server {server_id}, channel {channel_id}")
+                "Processing session update for server %s, channel %s", server_id, channel_id)
 
             session_data = await asyncio.to_thread(read_json, "session.json") or {}
 
@@ -443,7 +668,7 @@ async def process_session_updates() -> None:
 
             session_update_queue.task_done()
             log.debug(
-                f"Completed session update for server {server_id}, channel {channel_id}")
+                "Completed session update for server %s, channel %s", server_id, channel_id)
         except Exception as e:
             log.error(f"Error in process_session_updates: {e}")
             # Ensure the queue item is marked as done even on error
@@ -469,7 +694,7 @@ async def update_session_data(server_id: str, channel_id: str, new_data: Dict[st
     # Queue the update for persistent storage
     await session_update_queue.put((server_id, channel_id, new_data))
     log.debug(
-        f"Queued session update for server {server_id}, channel {channel_id}")
+        "Queued session update for server %s, channel %s", server_id, channel_id)
 
 
 def get_session_data(server_id: str, channel_id: str) -> Optional[Dict[str, Any]]:
@@ -494,10 +719,9 @@ async def clear_message_cache(server_id: str, channel_id: str) -> None:
         server_id: ID do servidor
         channel_id: ID do canal
     """
-    cache_data = await asyncio.to_thread(read_json, "messages_cache.json")
-    if cache_data and server_id in cache_data and channel_id in cache_data[server_id]:
-        del cache_data[server_id][channel_id]
-        await asyncio.to_thread(write_json, "messages_cache.json", cache_data)
+    if server_id in messages_cache and channel_id in messages_cache[server_id]:
+        del messages_cache[server_id][channel_id]
+        messages_cache_dirty.set()
         log.info(
             f"Cleared message cache for server {server_id}, channel {channel_id}")
 
@@ -521,7 +745,8 @@ async def remove_session_data(server_id: str, channel_id: str) -> None:
     await clear_message_cache(server_id, channel_id)
 
 
-async def remove_sent_messages_from_cache(server_id: str, channel_id: str) -> None:
+async def remove_sent_messages_from_cache(server_id: str, channel_id: str,
+                                          consumed: Optional[Dict[str, str]] = None) -> None:
     """
     Remove sent messages from cache for a specific channel.
     Only removes messages that have been processed by the AI.
@@ -529,12 +754,29 @@ async def remove_sent_messages_from_cache(server_id: str, channel_id: str) -> No
     Args:
         server_id: Server ID
         channel_id: Channel ID
+        consumed: Snapshot of the channel's cache that was sent to the AI.
+            If None, the channel's cache is cleared completely.
     """
-    cache_data = await asyncio.to_thread(read_json, "messages_cache.json")
-    if cache_data and server_id in cache_data and channel_id in cache_data[server_id]:
-        # Instead of keeping only the last message, we'll clear the cache completely
-        # This is because the AI has already processed all messages in the cache
-        cache_data[server_id][channel_id] = {}
-        await asyncio.to_thread(write_json, "messages_cache.json", cache_data)
-        log.info(
-            f"Removed processed messages from cache for server {server_id}, channel {channel_id}")
+    if not (server_id in messages_cache and channel_id in messages_cache[server_id]):
+        return
+
+    remaining = {}
+    if consumed is not None:
+        # Keep entries captured while the AI was generating. Entries are keyed,
+        # so each one is checked against the snapshot with a single lookup.
+        for key, text in messages_cache[server_id][channel_id].items():
+            sent = consumed.get(key)
+            if sent is None:
+                remaining[key] = text
+            elif text != sent:
+                if text.startswith(sent):
+                    # More messages were grouped into this entry after it was sent
+                    remaining[key] = text[len(sent):].lstrip("\n")
+                else:
+                    # The entry was replaced (e.g. a new "Reply"), keep it whole
+                    remaining[key] = text
+
+    messages_cache[server_id][channel_id] = remaining
+    messages_cache_dirty.set()
+    log.info(
+        f"Removed processed messages from cache for server {server_id}, channel {channel_id}")
@@ -14,6 +14,55 @@ from utils import update_session_data, get_session_data
 # Global session data
 session_data: Dict[str, Any] = {}
 
+# Shared HTTP session for every aiohttp request of the bot, created lazily
+http_session: Optional[aiohttp.ClientSession] = None
+
+# Resolved webhook objects, keyed by webhook URL
+webhooks: Dict[str, discord.Webhook] = {}
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session, creating it if missing or closed.
+
+    Returns:
+        aiohttp.ClientSession: Pooled HTTP session
+    """
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75))
+        # Cached webhooks are bound to the previous session
+        webhooks.clear()
+    return http_session
+
+
+def get_webhook(url: str) -> discord.Webhook:
+    """
+    Return the webhook object for a URL, resolving it only once.
+
+    Args:
+        url: Webhook URL
+
+    Returns:
+        discord.Webhook: Webhook bound to the shared HTTP session
+    """
+    session = get_http_session()
+    webhook_obj = webhooks.get(url)
+    if webhook_obj is None:
+        webhook_obj = discord.Webhook.from_url(url, session=session)
+        webhooks[url] = webhook_obj
+    return webhook_obj
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session."""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+    webhooks.clear()
+
 
 class WebHook(commands.Cog):
     def __init__(self, bot):
@@ -30,11 +79,10 @@ class WebHook(commands.Cog):
         Returns:
             Optional[bytes]: Avatar image data or None if failed
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return await response.read()
-                return None
+        async with get_http_session().get(url) as response:
+            if response.status == 200:
+                return await response.read()
+            return None
 
     async def _create_webhook(self, interaction: discord.Interaction,
                               channel: discord.TextChannel,
@@ -217,17 +265,15 @@ class WebHook(commands.Cog):
                 # Update existing webhook
                 WB_url = session["webhook_url"]
                 try:
-                    async with aiohttp.ClientSession() as session:
-                        webhook_obj = discord.Webhook.from_url(
-                            WB_url, session=session)
-                        avatar_bytes = await self._fetch_avatar(character_info["avatar_url"])
-                        if avatar_bytes is None:
-                            avatar_bytes = b""
-                        await webhook_obj.edit(
-                            name=character_info["name"],
-                            avatar=avatar_bytes,
-                            reason=f"Updating Webhook - {character_info['name']}"
-                        )
+                    webhook_obj = get_webhook(WB_url)
+                    avatar_bytes = await self._fetch_avatar(character_info["avatar_url"])
+                    if avatar_bytes is None:
+                        avatar_bytes = b""
+                    await webhook_obj.edit(
+                        name=character_info["name"],
+                        avatar=avatar_bytes,
+                        reason=f"Updating Webhook - {character_info['name']}"
+                    )
                     utils.log.info(
                         f"Updated existing webhook for channel {channel_id_str}")
                 except Exception as e:
@@ -326,10 +372,9 @@ class WebHook(commands.Cog):
             webhook_url = session.get("webhook_url")
             if webhook_url:
                 try:
-                    async with aiohttp.ClientSession() as session:
-                        webhook = discord.Webhook.from_url(
-                            webhook_url, session=session)
-                        await webhook.delete(reason="Bot removed from channel")
+                    webhook = get_webhook(webhook_url)
+                    await webhook.delete(reason="Bot removed from channel")
+                    webhooks.pop(webhook_url, None)
                     utils.log.info(
                         f"Deleted webhook for channel {channel_id_str}")
                 except Exception as e:
@@ -356,21 +401,22 @@ async def webhook_send(url: str, message: str) -> None:
     """
     Send a message via webhook.
 
+    Lines are sent one after another so they keep their order; the shared
+    HTTP session keeps the connection alive between them.
+
     Args:
         url: Webhook URL
         message: Message to send
     """
-    async with aiohttp.ClientSession() as session:
-        webhook_obj = discord.Webhook.from_url(url, session=session)
-
-        # Check if we should send line by line
-        if utils.config_yaml["Options"].get("send_message_line_by_line", False):
-            lines = message.split('\n')
-            for line in lines:
-                if line.strip():  # Skip empty lines
-                    await webhook_obj.send(line)
-        else:
-            await webhook_obj.send(message)
+    webhook_obj = get_webhook(url)
+
+    # Check if we should send line by line
+    if utils.config.options.send_message_line_by_line:
+        for line in message.split('\n'):
+            if line.strip():  # Skip empty lines
+                await webhook_obj.send(line)
+    else:
+        await webhook_obj.send(message)
 
 
 async def setup(bot):